@@ -1,10 +1,8 @@
 import os
+import functools
 from typing import Dict
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
-
 REQUIRED_ENV_VARS = {
     'GROQ_API_KEY': 'Groq API key for LLM processing',
     'SERPAPI_KEY': 'SerpAPI key for web searches',
@@ -33,11 +31,20 @@ def validate_env_vars() -> Dict[str, str]:
 
     return env_vars
 
-# Validate environment variables on import
-try:
-    env_vars = validate_env_vars()
-except EnvironmentError as e:
-    print(f"Environment Error: {str(e)}")
-    env_vars = {}
+@functools.lru_cache(maxsize=1)
+def get_env_vars() -> Dict[str, str]:
+    """
+    Load and validate environment variables once per process.
+    Returns an empty dictionary if validation fails.
+    """
+    # Only parse the .env file when the environment is missing something
+    if not all(os.getenv(var) for var in REQUIRED_ENV_VARS):
+        load_dotenv()
+
+    try:
+        return validate_env_vars()
+    except EnvironmentError as e:
+        print(f"Environment Error: {str(e)}")
+        return {}
 
     
\ No newline at end of file
@@ -1,84 +1,127 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import io
+import csv
 import json
-from typing import Optional, Dict, List
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+import functools
+from typing import Optional, Dict, List, Tuple, Callable
 import requests
-from datetime import datetime
-import groq
-from config import env_vars
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from config import get_env_vars
+
+# Number of entity batches processed concurrently (each one waits on an LLM call)
+MAX_WORKERS = 16
+# Number of SerpApi searches in flight at once, matching the HTTP connection pool
+SEARCH_WORKERS = 32
+# Timeout in seconds for a single SerpApi request
+SEARCH_TIMEOUT = 10
+# Number of distinct queries / prompts kept in the in-memory result caches
+CACHE_SIZE = 4096
+# Number of entities sent to the LLM in a single completion request
+BATCH_SIZE = 10
+# Limits on the search context sent to the LLM, to keep prompt tokens down
+MAX_CONTEXT_RESULTS = 3
+MAX_TITLE_CHARS = 120
+MAX_SNIPPET_CHARS = 300
+# Maximum requests per second sent to each API
+SERPAPI_RATE_LIMIT = 5
+GROQ_RATE_LIMIT = 30
+
+GOOGLE_CREDENTIALS_FILE = 'sustained-node-441417-b2-873b87007eca.json'
+GOOGLE_SHEETS_SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
+# Access tokens closer than this to expiry are refreshed in the background
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+# Sheets taller than this are fetched as several row ranges in one batchGet call
+SHEET_CHUNK_ROWS = 5000
+
+def _column_letter(index: int) -> str:
+    """Convert a 1-based column index to its A1 notation letters (1 -> A, 27 -> AA)"""
+    letters = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+def _unique_columns(names: List[str]) -> List[str]:
+    """Suffix repeated header names with .1, .2, ... like pandas' C CSV engine does"""
+    seen: Dict[str, int] = {}
+    unique = []
+    for name in names:
+        candidate = name
+        while candidate in seen:
+            seen[name] += 1
+            candidate = f"{name}.{seen[name]}"
+        seen[candidate] = 0
+        unique.append(candidate)
+    return unique
+
+class EmptySheetError(Exception):
+    """Raised when a Google Sheet has no values; exceptions are never cached"""
+
+class RateLimiter:
+    """Thread-safe token bucket that blocks callers to stay under a request rate"""
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Wait until a token is available and consume it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
 
 class DataProcessor:
     def __init__(self):
         self.df: Optional[pd.DataFrame] = None
         self.primary_column: Optional[str] = None
-        self.google_creds = None
 
-    def _load_google_credentials(self) -> Optional[Credentials]:
-        """Loads Google Sheets credentials from a JSON file."""
+    def load_google_sheet(self, sheet_id: str) -> bool:
+        """Loads a Google Sheet into a pandas DataFrame."""
         try:
-            # Pass the file path as a string, not the file object
-            creds = Credentials.from_service_account_file('sustained-node-441417-b2-873b87007eca.json')
-
-            # Define the required API scopes
-            scopes = ['https://www.googleapis.com/auth/spreadsheets.readonly']
-            
-            # Ensure the credentials include the necessary scopes
-            creds = creds.with_scopes(scopes)
-            return creds
-        
+            # Load credentials only when needed
+            _google_credentials()
+            _refresh_credentials_in_background()
         except FileNotFoundError:
             st.error("Google credentials file not found. Please ensure the file exists and is in the correct location.")
-            return None
+            return False
         except json.JSONDecodeError:
             st.error("Invalid JSON format in Google Sheets credentials file.")
-            return None
+            return False
         except Exception as e:
             st.error(f"Error loading Google Sheets credentials: {str(e)}")
-            return None
+            return False
 
-    def load_google_sheet(self, sheet_id: str) -> bool:
-        """Loads a Google Sheet into a pandas DataFrame."""
         try:
-            # Load credentials only when needed
-            self.google_creds = self._load_google_credentials()
-            if not self.google_creds:
-                return False
-                
-            # Use the credentials to authorize the Google Sheets API client
-            service = build('sheets', 'v4', credentials=self.google_creds)
-            sheet = service.spreadsheets()
-            
-            # Fetch the values from the sheet (adjust range as needed)
-            result = sheet.values().get(spreadsheetId=sheet_id, range='A1:ZZ1000').execute()
-            values = result.get('values', [])
-            
-            if not values:
-                st.error("No data found in Google Sheet.")
-                return False
-            
-            # Convert to pandas DataFrame
-            self.df = pd.DataFrame(values[1:], columns=values[0])
-            
-            # Clean up data (strip leading/trailing whitespaces and fill NaN values)
-            self.df = self.df.fillna('')
-            self.df = self.df.astype(str)
-            for column in self.df.columns:
-                self.df[column] = self.df[column].str.strip()
-            
+            self.df = _read_sheet(sheet_id)
             return True
+        except EmptySheetError:
+            st.error("No data found in Google Sheet.")
+            return False
         except Exception as e:
             st.error(f"Error loading Google Sheet: {str(e)}")
             return False
+
     def load_csv(self, file) -> bool:
         """Load CSV file into a DataFrame"""
         try:
-            self.df = pd.read_csv(file)
-            self.df = self.df.fillna('')
-            self.df = self.df.astype(str)
-            for column in self.df.columns:
-                self.df[column] = self.df[column].str.strip()
+            self.df = _read_csv(file.getvalue())
             return True
         except Exception as e:
             st.error(f"Error loading CSV: {str(e)}")
@@ -88,19 +131,29 @@ class DataProcessor:
         """Get list of column names in the DataFrame"""
         return list(self.df.columns) if self.df is not None else []
 
-    def get_value(self, row: pd.Series, column: str) -> str:
-        """Safely get a value from a row, handling missing values"""
-        try:
-            value = row[column]
-            if pd.isna(value) or value is None:
-                return ""
-            return str(value).strip()
-        except Exception:
-            return ""
-
 class WebSearcher:
     def __init__(self):
-        self.api_key = env_vars['SERPAPI_KEY']
+        self.api_key = get_env_vars()['SERPAPI_KEY']
+        # Shared across worker threads so connections are reused between calls
+        self.session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=SEARCH_WORKERS, pool_maxsize=SEARCH_WORKERS, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.rate_limiter = RateLimiter(SERPAPI_RATE_LIMIT)
+        # Repeated queries are served from memory; failures raise and are not cached
+        self._fetch_results = functools.lru_cache(maxsize=CACHE_SIZE)(self._fetch_results)
+    
+    def _fetch_results(self, query: str) -> List[Dict]:
+        """Fetch organic results for a query from SerpApi"""
+        params = {
+            "api_key": self.api_key,
+            "q": query,
+            "num": 5  # Number of results to return
+        }
+        self.rate_limiter.acquire()
+        response = self.session.get("https://serpapi.com/search", params=params, timeout=SEARCH_TIMEOUT)
+        response.raise_for_status()
+        return response.json().get('organic_results', [])
     
     def search(self, query: str) -> List[Dict]:
         """Perform a web search using SerpApi"""
@@ -109,15 +162,7 @@ class WebSearcher:
             return []
             
         try:
-            params = {
-                "api_key": self.api_key,
-                "q": query.strip(),
-                "num": 5  # Number of results to return
-            }
-            response = requests.get("https://serpapi.com/search", params=params)
-            response.raise_for_status()
-            results = response.json().get('organic_results', [])
-            return results
+            return self._fetch_results(query.strip())
         except requests.exceptions.RequestException as e:
             st.error(f"Search error: {str(e)}")
             return []
@@ -127,7 +172,70 @@ class WebSearcher:
 
 class LLMProcessor:
     def __init__(self):
-        self.client = groq.Groq(api_key=env_vars['GROQ_API_KEY'])
+        import groq
+
+        self.client = groq.Groq(api_key=get_env_vars()['GROQ_API_KEY'])
+        self.rate_limiter = RateLimiter(GROQ_RATE_LIMIT)
+        # Keyed on (context, prompt) so duplicate entities skip the completion call
+        self._complete = functools.lru_cache(maxsize=CACHE_SIZE)(self._complete)
+        self._complete_batch = functools.lru_cache(maxsize=CACHE_SIZE)(self._complete_batch)
+    
+    def _complete(self, context: str, prompt: str) -> str:
+        """Run a chat completion over the given search context"""
+        system_prompt = """Extract the requested information from the provided search results. 
+        If the information cannot be found, respond with 'Not found'.
+        Be concise and only return the requested information."""
+        
+        self.rate_limiter.acquire()
+        completion = self.client.chat.completions.create(
+            model="mixtral-8x7b-32768",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"Context:\n{context}\n\nPrompt: {prompt}"}
+            ],
+            temperature=0.3
+        )
+        
+        return completion.choices[0].message.content.strip()
+    
+    def _complete_batch(self, content: str) -> str:
+        """Run a single chat completion covering several numbered items"""
+        system_prompt = """Extract the requested information for each numbered item from its search results.
+        Respond only with a JSON array of strings containing one answer per item, in the same order.
+        If the information for an item cannot be found, use 'Not found' for that item.
+        Be concise and only return the requested information."""
+        
+        self.rate_limiter.acquire()
+        completion = self.client.chat.completions.create(
+            model="mixtral-8x7b-32768",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": content}
+            ],
+            temperature=0.3
+        )
+        
+        return completion.choices[0].message.content.strip()
+    
+    @staticmethod
+    def _build_context(search_results: List[Dict]) -> str:
+        """Format the top unique search results as a trimmed context for the LLM"""
+        seen = set()
+        unique_results = []
+        for result in search_results:
+            snippet = result.get('snippet', '')
+            if snippet in seen:
+                continue
+            seen.add(snippet)
+            unique_results.append(result)
+            if len(unique_results) == MAX_CONTEXT_RESULTS:
+                break
+        
+        return "\n".join([
+            f"Title: {result.get('title', '')[:MAX_TITLE_CHARS]}\n"
+            f"Snippet: {result.get('snippet', '')[:MAX_SNIPPET_CHARS]}\n"
+            for result in unique_results
+        ])
     
     def process_results(self, search_results: List[Dict], prompt: str) -> str:
         """Process search results using LLM"""
@@ -135,46 +243,248 @@ class LLMProcessor:
             return "No search results found"
             
         try:
-            context = "\n".join([
-                f"Title: {result.get('title', '')}\n"
-                f"Snippet: {result.get('snippet', '')}\n"
-                for result in search_results
-            ])
-            
-            system_prompt = """Extract the requested information from the provided search results. 
-            If the information cannot be found, respond with 'Not found'.
-            Be concise and only return the requested information."""
-            
-            completion = self.client.chat.completions.create(
-                model="mixtral-8x7b-32768",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Context:\n{context}\n\nPrompt: {prompt}"}
-                ],
-                temperature=0.3
-            )
-            
-            return completion.choices[0].message.content.strip()
+            context = self._build_context(search_results)
+            return self._complete(context, prompt)
         except Exception as e:
             st.error(f"LLM processing error: {str(e)}")
             return "Error processing results"
     
+    def process_batch(self, items: List[Tuple[str, List[Dict]]]) -> List[str]:
+        """Process several (prompt, search results) pairs with a single LLM call"""
+        answers = ["No search results found"] * len(items)
+        pending = [position for position, (_, search_results) in enumerate(items) if search_results]
+        if not pending:
+            return answers
+        
+        content = "\n\n".join(
+            f"{number}. Prompt: {items[position][0]}\n"
+            f"Context:\n{self._build_context(items[position][1])}"
+            for number, position in enumerate(pending, start=1)
+        )
+        
+        try:
+            response = self._complete_batch(content)
+            # Ignore any text or code fences the model puts around the array
+            extracted = json.loads(response[response.find('['):response.rfind(']') + 1])
+            if not isinstance(extracted, list) or len(extracted) != len(pending):
+                raise ValueError("LLM response does not match the number of items")
+        except (json.JSONDecodeError, ValueError):
+            # Fall back to one request per item when the batch answer is unusable
+            extracted = [self.process_results(items[position][1], items[position][0]) for position in pending]
+        except Exception as e:
+            st.error(f"LLM processing error: {str(e)}")
+            extracted = ["Error processing results"] * len(pending)
+        
+        for position, answer in zip(pending, extracted):
+            answers[position] = str(answer).strip()
+        return answers
+    
+
+def _clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """Fill missing values and strip whitespace from every cell in one pass"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        return df.fillna('').astype(str).apply(lambda column: column.str.strip())
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError):
+        # Mixed-type object columns cannot be converted
+        return df.fillna('').astype(str).apply(lambda column: column.str.strip())
+
+    # Trim with Arrow's string kernel and keep the resulting columns Arrow-backed
+    columns = [
+        pc.utf8_trim_whitespace(pc.cast(column, pa.string()).fill_null(''))
+        for column in table.columns
+    ]
+    return pa.Table.from_arrays(columns, names=table.column_names).to_pandas(types_mapper=pd.ArrowDtype)
+
+def _read_csv_arrow(file_bytes: bytes) -> pd.DataFrame:
+    """Parse a CSV with pyarrow's multithreaded reader, keeping every value as text"""
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    # Arrow only takes column types by name, so read the header row first. Typing every
+    # column as string stops Arrow from reformatting values it would infer as numbers
+    # or timestamps (e.g. "3.0" -> "3", "2020-05-01 10:00" -> "2020-05-01 10:00:00")
+    header = next(csv.reader(io.TextIOWrapper(io.BytesIO(file_bytes), encoding='utf-8-sig', newline='')))
+    convert_options = pa_csv.ConvertOptions(
+        column_types={name: pa.string() for name in header},
+        strings_can_be_null=True
+    )
+    table = pa_csv.read_csv(io.BytesIO(file_bytes), convert_options=convert_options)
+    # Unlike pandas' C engine, Arrow keeps repeated header names as they are; rename
+    # them so every column stays selectable and converts cleanly to pandas
+    table = table.rename_columns(_unique_columns(table.column_names))
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+@st.cache_data(show_spinner=False)
+def _read_csv(file_bytes: bytes) -> pd.DataFrame:
+    """Parse and clean an uploaded CSV, cached on the file contents"""
+    try:
+        # The Arrow reader parses in parallel; fall back to the C engine without pyarrow
+        # or for files it rejects (ragged rows, quoted newlines) that the C engine accepts
+        df = _read_csv_arrow(file_bytes)
+    except (ImportError, ValueError, csv.Error, StopIteration):
+        df = pd.read_csv(io.BytesIO(file_bytes), dtype=str)
+    return _clean_dataframe(df)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _read_sheet(sheet_id: str) -> pd.DataFrame:
+    """Fetch and clean the first sheet of a spreadsheet, cached for five minutes"""
+    sheet = get_sheets_service().spreadsheets()
+    
+    # Look up the first sheet's real dimensions so only its grid is requested
+    metadata = sheet.get(
+        spreadsheetId=sheet_id,
+        fields="sheets.properties(title,gridProperties)"
+    ).execute()
+    properties = metadata['sheets'][0]['properties']
+    title = properties['title'].replace("'", "''")
+    row_count = properties['gridProperties']['rowCount']
+    last_column = _column_letter(properties['gridProperties']['columnCount'])
+    
+    if row_count <= SHEET_CHUNK_ROWS:
+        result = sheet.values().get(
+            spreadsheetId=sheet_id,
+            range=f"'{title}'!A1:{last_column}{row_count}"
+        ).execute()
+        values = result.get('values', [])
+    else:
+        starts = range(1, row_count + 1, SHEET_CHUNK_ROWS)
+        ranges = [
+            f"'{title}'!A{start}:{last_column}{min(start + SHEET_CHUNK_ROWS - 1, row_count)}"
+            for start in starts
+        ]
+        result = sheet.values().batchGet(spreadsheetId=sheet_id, ranges=ranges).execute()
+        
+        # The API omits trailing empty rows of each range, so pad every chunk
+        # back to its full height to keep rows aligned, then drop the tail
+        values = []
+        for value_range in result.get('valueRanges', []):
+            chunk = value_range.get('values', [])
+            values.extend(chunk + [[]] * (SHEET_CHUNK_ROWS - len(chunk)))
+        while values and not values[-1]:
+            values.pop()
+    
+    if not values:
+        # Raised rather than returned so an empty sheet is re-fetched on the next load
+        raise EmptySheetError(sheet_id)
+    
+    # Clean up data (strip leading/trailing whitespaces and fill NaN values)
+    # Sheets may repeat header names (e.g. blank cells); make them unique so every
+    # column can be selected on its own
+    return _clean_dataframe(pd.DataFrame(values[1:], columns=_unique_columns(values[0])))
 
-def process_entity(entity: str, query_template: str, searcher: WebSearcher, llm_processor: LLMProcessor) -> Dict:
-    """Process a single entity and return results"""
+@st.cache_resource
+def get_searcher() -> WebSearcher:
+    """Shared WebSearcher, so its connection pool and cache survive reruns"""
+    return WebSearcher()
+
+@st.cache_resource
+def get_llm() -> LLMProcessor:
+    """Shared LLMProcessor, so the Groq client and its cache survive reruns"""
+    return LLMProcessor()
+
+@st.cache_resource
+def _google_credentials():
+    """Load the service-account credentials once per server process"""
+    # Imported lazily: the Google client libraries are slow to import
+    from google.oauth2.service_account import Credentials
+
+    return Credentials.from_service_account_file(GOOGLE_CREDENTIALS_FILE).with_scopes(GOOGLE_SHEETS_SCOPES)
+
+_credentials_refresh_lock = threading.Lock()
+
+def _refresh_credentials_in_background() -> None:
+    """Refresh an access token nearing expiry while requests keep using the current one"""
+    creds = _google_credentials()
+    # Without a token yet, the first API call fetches one synchronously
+    if not creds.token or creds.expiry is None:
+        return
+    if creds.expiry - datetime.now(timezone.utc).replace(tzinfo=None) > TOKEN_REFRESH_MARGIN:
+        return
+    if not _credentials_refresh_lock.acquire(blocking=False):
+        return  # A refresh is already running
+
+    def refresh():
+        from google.auth.transport.requests import Request
+
+        try:
+            creds.refresh(Request())
+        except Exception:
+            pass  # The next API call refreshes synchronously instead
+        finally:
+            _credentials_refresh_lock.release()
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+def get_sheets_service():
+    """Build a Google Sheets API client for the calling thread"""
+    from googleapiclient.discovery import build
+
+    # Not cached: the client's httplib2 transport is not thread-safe, so sessions must
+    # not share one. static_discovery uses the discovery document bundled with
+    # googleapiclient, so building a client makes no network request
+    return build('sheets', 'v4', credentials=_google_credentials(), cache_discovery=False, static_discovery=True)
+
+def compile_query_template(query_template: str) -> Callable[[str], str]:
+    """Split the template once so building a query per entity is a simple concatenation"""
+    prefix, _, suffix = query_template.partition("{entity}")
+    if "{entity}" in suffix:
+        # Several placeholders: substitute all of them on every call
+        return lambda entity: query_template.replace("{entity}", entity)
+    return lambda entity: prefix + entity + suffix
+
+def process_entities(entities: List[str], build_query: Callable[[str], str], searcher: WebSearcher, llm_processor: LLMProcessor,
+                     search_pool: Optional[Executor] = None) -> List[Dict]:
+    """Process a batch of entities with a single LLM call and return results in order"""
     try:
-        entity_str = str(entity).strip()
-        if not entity_str:
-            return {"Entity": entity, "Extracted Information": "Empty entity value"}
+        results = [None] * len(entities)
+        pending = []
+        for position, entity in enumerate(entities):
+            entity_str = str(entity).strip()
+            if not entity_str:
+                results[position] = {"Entity": entity, "Extracted Information": "Empty entity value"}
+                continue
+            
+            pending.append((position, entity_str, build_query(entity_str)))
         
-        query = query_template.replace("{entity}", entity_str)
-        search_results = searcher.search(query)
-        extracted_info = llm_processor.process_results(search_results, query)
+        # Run the batch's searches side by side on the shared search pool
+        queries = [query for _, _, query in pending]
+        search_results = list(search_pool.map(searcher.search, queries) if search_pool else map(searcher.search, queries))
         
-        return {"Entity": entity_str, "Extracted Information": extracted_info}
+        extracted = llm_processor.process_batch(list(zip(queries, search_results)))
+        for (position, entity_str, _), extracted_info in zip(pending, extracted):
+            results[position] = {"Entity": entity_str, "Extracted Information": extracted_info}
+        
+        return results
     except Exception as e:
-        st.error(f"Error processing entity '{entity}': {str(e)}")
-        return {"Entity": str(entity), "Extracted Information": "Error during processing"}
+        st.error(f"Error processing entities: {str(e)}")
+        return [{"Entity": str(entity), "Extracted Information": "Error during processing"} for entity in entities]
+
+@st.cache_data(show_spinner=False)
+def _results_to_csv(results: pd.DataFrame) -> bytes:
+    """Serialize the results table to CSV bytes for the download button"""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        return results.to_csv(index=False).encode('utf-8')
+
+    buffer = io.BytesIO()
+    pa_csv.write_csv(pa.Table.from_pandas(results, preserve_index=False), buffer)
+    return buffer.getvalue()
+
+def _script_thread_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Create a thread pool whose workers can report errors through Streamlit"""
+    ctx = get_script_run_ctx()
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    )
 
 def main():
     st.title("AI Data Enrichment Agent")
@@ -223,22 +533,59 @@ def main():
                 st.error("Please enter a valid query template containing {entity}")
                 return
                 
-            searcher = WebSearcher()
-            llm_processor = LLMProcessor()
+            build_query = compile_query_template(query_template)
+            searcher = get_searcher()
+            llm_processor = get_llm()
+            
+            # Read the primary column directly rather than boxing every row with iterrows(),
+            # selecting it by position so a repeated column name still yields a single column
+            df = st.session_state.data_processor.df
+            entities = df.iloc[:, columns.index(primary_column)].astype(str).str.strip().to_numpy()
+            # Process each distinct entity once, then map results back onto every row
+            unique_entities, inverse = np.unique(entities, return_inverse=True)
+            total_unique = len(unique_entities)
+            unique_results = [None] * total_unique
             
-            results = []
-            progress_bar = st.progress(0)
-            total_rows = len(st.session_state.data_processor.df)
+            # Report progress and the latest finished batch while the run is in flight
+            status = st.status(f"Processing {total_unique} unique entities...", expanded=True)
+            with status:
+                progress_bar = st.progress(0)
+                latest_batch = st.empty()
             
-            # Process each row
-            for idx, row in st.session_state.data_processor.df.iterrows():
-                entity = st.session_state.data_processor.get_value(row, primary_column)
-                result = process_entity(entity, query_template, searcher, llm_processor)
-                results.append(result)
+            # Process batches concurrently, keeping results in input order. Searches go
+            # through their own pool so later batches search while earlier ones wait on the LLM
+            with _script_thread_pool(SEARCH_WORKERS) as search_pool, _script_thread_pool(MAX_WORKERS) as executor:
+                futures = {
+                    executor.submit(
+                        process_entities,
+                        unique_entities[start:start + BATCH_SIZE],
+                        build_query,
+                        searcher,
+                        llm_processor,
+                        search_pool
+                    ): start
+                    for start in range(0, total_unique, BATCH_SIZE)
+                }
                 
-                # Update progress
-                progress = (idx + 1) / total_rows
-                progress_bar.progress(progress)
+                # Only redraw the progress bar about once per percent of work
+                tick = max(1, total_unique // 100)
+                completed = reported = 0
+                for future in as_completed(futures):
+                    batch_results = future.result()
+                    start = futures[future]
+                    unique_results[start:start + len(batch_results)] = batch_results
+                    
+                    # Update progress
+                    completed += len(batch_results)
+                    if completed - reported >= tick or completed == total_unique:
+                        progress_bar.progress(completed / total_unique)
+                        latest_batch.dataframe(pd.DataFrame(batch_results))
+                        status.update(label=f"Processed {completed} of {total_unique} unique entities...")
+                        reported = completed
+            
+            status.update(label=f"Processed {total_unique} unique entities", state="complete", expanded=False)
+            
+            results = [unique_results[position] for position in inverse]
             
             # Create results DataFrame
             st.session_state.results = pd.DataFrame(results)
@@ -251,7 +598,7 @@ def main():
             if not st.session_state.results.empty:
                 st.download_button(
                     label="Download CSV",
-                    data=st.session_state.results.to_csv(index=False),
+                    data=_results_to_csv(st.session_state.results),
                     file_name=f"enriched_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv"
                 )